@@ -0,0 +1,168 @@
+#core/cli.py
+"""Headless command-line interface: ``python -m core <command> ...``.
+
+Only touches the core package, so it runs without Tk, ttkbootstrap or
+matplotlib and is safe to use from cron jobs on display-less servers.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from core import expense_manager
+from core.currency import load_rate_table
+from core.settings_manager import SettingsManager
+
+
+def add_filter_args(parser):
+    parser.add_argument("-k", "--keyword", default="", help="match against name or category")
+    parser.add_argument("-c", "--category", choices=expense_manager.INTERNAL_CATEGORIES)
+    parser.add_argument("--from", dest="start_date", help="start date (YYYY-MM-DD or DD-MM-YYYY)")
+    parser.add_argument("--to", dest="end_date", help="end date (YYYY-MM-DD or DD-MM-YYYY)")
+
+
+def add_output_args(parser, formats, default):
+    parser.add_argument("-f", "--format", choices=formats, default=default)
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+
+
+def selected(args):
+    expenses = expense_manager.iter_expenses()
+    return expense_manager.iter_search_and_filter(
+        expenses, args.keyword, args.category, args.start_date, args.end_date
+    )
+
+
+def open_output(path):
+    if path:
+        return open(path, 'w', newline='', encoding='utf-8')
+    return sys.stdout
+
+
+def write_rows(rows, out, fmt, fieldnames):
+    """Stream dict rows to ``out`` as JSON-lines or CSV, one row at a time."""
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    else:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+
+
+def cmd_list(args):
+    rows = map(expense_manager.export_row, selected(args))
+    with_output(args, lambda out: write_rows(rows, out, args.format, expense_manager.CSV_FIELDS))
+
+
+def cmd_summary(args):
+    settings = SettingsManager()
+    budget = args.budget if args.budget is not None else settings.get_budget()
+    rates = load_rate_table(settings.get_currency_code())
+    summary = expense_manager.get_summary(selected(args), monthly_budget=budget, rates=rates)
+
+    def write(out):
+        if args.format == "json":
+            out.write(json.dumps(summary, ensure_ascii=False, indent=4))
+        else:
+            out.write(expense_manager.format_summary(summary, settings.get_currency()))
+        out.write("\n")
+
+    with_output(args, write)
+
+
+def cmd_monthly(args):
+    rates = load_rate_table(SettingsManager().get_currency_code())
+    series = expense_manager.get_bar_data_by_month(selected(args), rates)
+    rows = ({"month": month, "amount": amount} for month, amount in series.items())
+    with_output(args, lambda out: write_rows(rows, out, args.format, ["month", "amount"]))
+
+
+def numbered_rows(infile, fmt, delimiter):
+    """Yield ``(line_number, row)`` pairs from a CSV or JSON-lines file."""
+    if fmt == "jsonl":
+        for line_number, line in enumerate(infile, 1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"line {line_number}: {e}")
+    else:
+        reader = csv.DictReader(infile, delimiter=delimiter)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def cmd_import(args):
+    with open(args.file, newline='', encoding='utf-8') as infile:
+        rows = numbered_rows(infile, args.format, args.delimiter)
+        currency_code = SettingsManager().get_currency_code()
+        expenses = expense_manager.load_expenses()
+        try:
+            rates = load_rate_table(currency_code)
+            added = expense_manager.import_expenses(expenses, rows, currency_code, rates)
+        except ValueError as e:
+            raise ValueError(f"{args.file}: {e} (nothing was imported)")
+    print(f"Imported {added} expenses from {args.file}", file=sys.stderr)
+
+
+def with_output(args, write):
+    out = open_output(args.output)
+    try:
+        write(out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core", description="Expense tracker without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("list", help="stream matching expenses")
+    add_filter_args(p)
+    add_output_args(p, ["jsonl", "csv"], "jsonl")
+    p.set_defaults(func=cmd_list)
+
+    p = commands.add_parser("export", help="export matching expenses to a file")
+    add_filter_args(p)
+    p.add_argument("output", help="destination file")
+    p.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv")
+    p.set_defaults(func=cmd_list)
+
+    p = commands.add_parser("summary", help="budget summary of matching expenses")
+    add_filter_args(p)
+    add_output_args(p, ["text", "json"], "text")
+    p.add_argument("-b", "--budget", type=float, help="monthly budget (defaults to settings)")
+    p.set_defaults(func=cmd_summary)
+
+    p = commands.add_parser("monthly", help="monthly totals of matching expenses")
+    add_filter_args(p)
+    add_output_args(p, ["jsonl", "csv"], "jsonl")
+    p.set_defaults(func=cmd_monthly)
+
+    p = commands.add_parser("import", help="append expenses from a CSV or JSON-lines file")
+    p.add_argument("file")
+    p.add_argument("-f", "--format", choices=["csv", "jsonl"], default="csv")
+    p.add_argument("-d", "--delimiter", default=",")
+    p.set_defaults(func=cmd_import)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); silence the flush at exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (ValueError, LookupError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
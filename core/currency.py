@@ -0,0 +1,149 @@
+#core/currency.py
+import bisect
+import csv
+import datetime
+import itertools
+import os
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+
+# Amounts are stored as integers in hundredths of a currency unit.
+SCALE = 100
+DEFAULT_CURRENCY = "INR"
+
+DEFAULT_RATES_PATH = os.path.join(
+    os.path.dirname(__file__),
+    '..',
+    'data',
+    'rates.csv'
+)
+
+CURRENCY_SYMBOLS = {
+    "INR": "₹",
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+}
+
+_loaded_tables = {}
+_serials = itertools.count()
+
+
+def to_minor(amount):
+    """Convert a user-entered amount (str, int, float or Decimal) to integer hundredths."""
+    try:
+        value = Decimal(str(amount).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount!r}")
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {amount!r}")
+    return int((value * SCALE).to_integral_value(ROUND_HALF_EVEN))
+
+
+def to_major(minor):
+    return minor / SCALE
+
+
+def amount_prefix(code, symbol=None):
+    """Prefix for amounts in ``code``, e.g. '₹' or 'CHF '.
+
+    ``symbol`` (the user's display setting) is used unless it is the symbol of
+    a different currency, so USD totals are never shown with '₹'.
+    """
+    known = CURRENCY_SYMBOLS.get(code)
+    if symbol and (symbol == known or symbol not in CURRENCY_SYMBOLS.values()):
+        return symbol
+    return known or f"{code} "
+
+
+def format_minor(minor):
+    """Exact decimal string for an integer amount, e.g. 15050 -> '150.50'."""
+    return str(Decimal(minor).scaleb(-2))
+
+
+class RateTable:
+    """Dated exchange rates into a single ``base`` (reporting) currency.
+
+    Each rate says how many units of ``base`` one unit of the currency buys and
+    applies from its date until the next dated rate for that currency.
+    """
+
+    def __init__(self, base=DEFAULT_CURRENCY, rows=()):
+        self.base = base
+        # Distinguishes tables in cache keys; a re-read file gets a new serial.
+        self.serial = next(_serials)
+        # currency -> (sorted start dates, matching rates)
+        self._index = {}
+        pending = {}
+        for on, currency, rate in rows:
+            pending.setdefault(currency, []).append((on, Decimal(rate)))
+        for currency, entries in pending.items():
+            entries.sort()
+            self._index[currency] = ([d for d, _ in entries], [r for _, r in entries])
+
+    @classmethod
+    def from_file(cls, filepath, base=DEFAULT_CURRENCY):
+        """Read a ``date,currency,rate`` CSV (dates as YYYY-MM-DD).
+
+        Raises ``ValueError`` naming the file and line of the first bad row.
+        """
+        rows = []
+        with open(filepath, newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                try:
+                    on = datetime.datetime.strptime(row['date'].strip(), "%Y-%m-%d").date()
+                    currency = row['currency'].strip().upper()
+                    rate = Decimal(row['rate'].strip())
+                except (KeyError, AttributeError, ValueError, InvalidOperation):
+                    rate = None
+                if rate is None or not currency or not rate.is_finite() or rate <= 0:
+                    raise ValueError(
+                        f"{filepath}, line {reader.line_num}: expected date (YYYY-MM-DD), "
+                        "currency and a positive rate."
+                    )
+                rows.append((on, currency, rate))
+        return cls(base, rows)
+
+    def period_start(self, currency, on):
+        """Start date of the rate period covering ``on`` (None for ``base``).
+
+        All amounts in the same currency and period share one rate, so they can
+        be summed first and converted once.
+        """
+        if currency == self.base:
+            return None
+        if currency not in self._index:
+            raise LookupError(f"No exchange rate for {currency} to {self.base}.")
+        dates, _ = self._index[currency]
+        i = bisect.bisect_right(dates, on) - 1
+        if i < 0:
+            raise LookupError(f"No exchange rate for {currency} on or before {on}.")
+        return dates[i]
+
+    def rate(self, currency, on):
+        if currency == self.base:
+            return Decimal(1)
+        start = self.period_start(currency, on)
+        dates, rates = self._index[currency]
+        return rates[bisect.bisect_left(dates, start)]
+
+    def convert(self, minor, currency, on):
+        """Convert an integer amount in ``currency`` on date ``on`` to ``base``."""
+        if currency == self.base:
+            return minor
+        return int((minor * self.rate(currency, on)).to_integral_value(ROUND_HALF_EVEN))
+
+
+def load_rate_table(base=DEFAULT_CURRENCY, filepath=None):
+    """Return the rate table for ``base``, re-reading the file only when it changes."""
+    filepath = os.path.normpath(filepath or DEFAULT_RATES_PATH)
+    if not os.path.exists(filepath):
+        return RateTable(base)
+    key = (filepath, base)
+    mtime = os.path.getmtime(filepath)
+    cached = _loaded_tables.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, RateTable.from_file(filepath, base))
+        _loaded_tables[key] = cached
+    return cached[1]
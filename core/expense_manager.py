@@ -2,7 +2,9 @@
 from collections import defaultdict
 import csv
 import datetime
-from core.storage import save_expenses, load_expenses
+from functools import lru_cache
+from core.currency import DEFAULT_CURRENCY, RateTable, amount_prefix, format_minor, to_major, to_minor
+from core.storage import save_expenses, load_expenses, iter_expenses
 
 INTERNAL_CATEGORIES = ["Food", "Home", "Work", "Fun", "Misc"]
 
@@ -22,79 +24,274 @@ CATEGORY_ICONS = {
     "Misc": "assets/icons/misc.png"
 }
 
-def add_expense(expenses, name, amount, category, date):
-    if category not in INTERNAL_CATEGORIES:
-        raise ValueError("Invalid category selected.")
-    expense = {
+def normalize_category(category):
+    """Match ``category`` against INTERNAL_CATEGORIES, ignoring case and padding."""
+    wanted = (category or "").strip().lower()
+    for c in INTERNAL_CATEGORIES:
+        if c.lower() == wanted:
+            return c
+    raise ValueError(f"Invalid category {category!r}; expected one of {', '.join(INTERNAL_CATEGORIES)}.")
+
+def make_expense(name, amount, category, date, currency=DEFAULT_CURRENCY, rates=None):
+    """Build a validated expense row.
+
+    With ``rates``, the currency must also be convertible on ``date`` so a typo
+    can't be saved and then break every summary.
+    """
+    category = normalize_category(category)
+    if not isinstance(date, str) or parse_date(date.strip()) is None:
+        raise ValueError(f"Invalid date {date!r}; use YYYY-MM-DD or DD-MM-YYYY.")
+    date = date.strip()
+    currency = currency.strip().upper()
+    if not currency:
+        raise ValueError("Currency code cannot be empty.")
+    if rates is not None:
+        try:
+            rates.rate(currency, parse_date(date))
+        except LookupError as e:
+            raise ValueError(str(e))
+    return {
         "name": name,
-        "amount": float(amount),
+        "amount_minor": to_minor(amount),
+        "currency": currency,
         "category": category,
         "date": date
     }
+
+def add_expense(expenses, name, amount, category, date, currency=DEFAULT_CURRENCY, rates=None):
+    expense = make_expense(name, amount, category, date, currency, rates)
     expenses.append(expense)
-    save_expenses(expenses)
+    _save(expenses, added=[expense])
+
+def import_expenses(expenses, numbered_rows, default_currency=DEFAULT_CURRENCY, rates=None):
+    """Validate ``(line_number, row)`` pairs and append them, saving once at the end.
+
+    Nothing is added if any row is invalid; the ``ValueError`` names its line.
+    Returns the count added.
+    """
+    new_expenses = []
+    for line, row in numbered_rows:
+        try:
+            if not isinstance(row, dict):
+                raise ValueError("expected an object with date, category, amount and name")
+            name = row.get('name') or row.get('description') or ""
+            currency = row.get('currency') or default_currency
+            new_expenses.append(
+                make_expense(name.strip(), row['amount'], row['category'], row['date'], currency, rates)
+            )
+        except KeyError as e:
+            raise ValueError(f"line {line}: missing column {e}")
+        except ValueError as e:
+            raise ValueError(f"line {line}: {e}")
+    if new_expenses:
+        expenses.extend(new_expenses)
+        _save(expenses, added=new_expenses)
+    return len(new_expenses)
 
 def delete_expense(expenses, index):
     if 0 <= index < len(expenses):
         removed = expenses.pop(index)
-        save_expenses(expenses)
+        _save(expenses, removed=[removed])
         return removed
     else:
         raise IndexError("Invalid index for deletion.")
 
 def update_expense(expenses, index, updated):
     if 0 <= index < len(expenses):
+        old = expenses[index]
         expenses[index] = updated
-        save_expenses(expenses)
+        _save(expenses, added=[updated], removed=[old])
 
 def search_expenses(expenses, keyword):
     keyword = keyword.lower().strip()
     if not keyword:
         return expenses
-    return [e for e in expenses if keyword in e['name'].lower() or keyword in e['category'].lower()]
+    return list(iter_search(expenses, keyword))
 
 def filter_expenses(expenses, category=None, start_date=None, end_date=None):
-    filtered = expenses
+    return list(iter_filter(expenses, category, start_date, end_date))
 
-    if category:
-        filtered = [e for e in filtered if e['category'] == category]
+@lru_cache(maxsize=4096)
+def parse_date(dstr):
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.datetime.strptime(dstr, fmt).date()
+        except ValueError:
+            continue
+    return None
 
-    def parse_date(dstr):
-        for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
-            try:
-                return datetime.datetime.strptime(dstr, fmt).date()
-            except ValueError:
-                continue
-        return None
+def iter_search(expenses, keyword):
+    """Lazily yield expenses whose name or category contains ``keyword``."""
+    keyword = keyword.lower().strip()
+    for e in expenses:
+        if not keyword or keyword in e['name'].lower() or keyword in e['category'].lower():
+            yield e
 
-    if start_date:
-        start = parse_date(start_date)
-        if start:
-            filtered = [e for e in filtered if parse_date(e['date']) and parse_date(e['date']) >= start]
+def iter_filter(expenses, category=None, start_date=None, end_date=None):
+    """Lazily yield expenses matching the category and inclusive date range."""
+    start = parse_date(start_date) if start_date else None
+    end = parse_date(end_date) if end_date else None
+    for e in expenses:
+        if category and e['category'] != category:
+            continue
+        if start or end:
+            d = parse_date(e['date'])
+            if not d or (start and d < start) or (end and d > end):
+                continue
+        yield e
 
-    if end_date:
-        end = parse_date(end_date)
-        if end:
-            filtered = [e for e in filtered if parse_date(e['date']) and parse_date(e['date']) <= end]
+def get_amount(expense):
+    """Amount of a single expense in its own currency, as a float."""
+    return to_major(expense['amount_minor'])
 
-    return filtered
+def grouped_totals(expenses, key, rates=None):
+    """Sum expenses per ``key(expense)`` in the rate table's reporting currency.
 
-def get_summary(expenses, monthly_budget=15000.0):
-    category_totals = defaultdict(float)
-    total_spent = 0.0
+    Amounts are summed as integers per (key, currency, rate period) and each
+    group is converted once, so the number of conversions depends on how often
+    rates change, not on the number of rows. Rows whose key is None are
+    skipped. Returns integer hundredths.
+    """
+    rates = rates or RateTable()
+    periods = {}
+    raw = defaultdict(int)
     for e in expenses:
-        category_totals[e['category']] += e['amount']
-        total_spent += e['amount']
+        k = key(e)
+        if k is None:
+            continue
+        currency = e['currency']
+        start = None
+        if currency != rates.base:
+            lookup = (currency, e['date'])
+            if lookup not in periods:
+                on = parse_date(e['date'])
+                if on is None:
+                    raise ValueError(f"Cannot convert {currency} expense with invalid date '{e['date']}'.")
+                periods[lookup] = rates.period_start(currency, on)
+            start = periods[lookup]
+        raw[(k, currency, start)] += e['amount_minor']
+
+    totals = defaultdict(int)
+    for (k, currency, start), minor in raw.items():
+        totals[k] += minor if start is None else rates.convert(minor, currency, start)
+    return totals
+
+def _new_totals(rates):
+    return {"rates": rates, "raw": {}, "converted": {}, "version": None, "length": 0}
+
+def _add_rows(totals, rows, sign=1):
+    """Add (or with ``sign=-1`` remove) rows from the raw integer sums.
+
+    Raw sums are kept per (currency, month) and, within that, per (category,
+    rate period). Returns the (currency, month) keys that changed.
+    """
+    rates = totals["rates"]
+    touched = set()
+    for e in rows:
+        currency = e['currency']
+        d = parse_date(e['date'])
+        month = f"{d.year}-{d.month:02d}" if d else None
+        start = None
+        if currency != rates.base:
+            if d is None:
+                raise ValueError(f"Cannot convert {currency} expense with invalid date '{e['date']}'.")
+            start = rates.period_start(currency, d)
+        period = totals["raw"].setdefault((currency, month), {})
+        entry = period.setdefault((e['category'], start), [0, 0])
+        entry[0] += sign * e['amount_minor']
+        entry[1] += sign
+        if entry[1] == 0:
+            del period[(e['category'], start)]
+        touched.add((currency, month))
+    return touched
+
+def _convert_periods(totals, touched):
+    """Re-convert only the (currency, month) buckets in ``touched``."""
+    rates = totals["rates"]
+    for key in touched:
+        currency = key[0]
+        period = totals["raw"].get(key)
+        if not period:
+            totals["raw"].pop(key, None)
+            totals["converted"].pop(key, None)
+            continue
+        converted = defaultdict(int)
+        for (category, start), (minor, _) in period.items():
+            converted[category] += minor if start is None else rates.convert(minor, currency, start)
+        totals["converted"][key] = dict(converted)
+
+def monthly_buckets(expenses, rates=None):
+    """Converted totals per (currency, month) as ``{category: integer hundredths}``.
+
+    For a Ledger from load_expenses the buckets are kept on the ledger. Saves
+    made through this module update only the (currency, month) buckets they
+    touch; a merge with another writer, a different rate table or any other
+    change rebuilds them. Other iterables are grouped on every call. Month is
+    None for rows whose date can't be parsed.
+    """
+    rates = rates or RateTable()
+    version = getattr(expenses, 'version', None)
+    if version is None:
+        totals = _new_totals(rates)
+        _convert_periods(totals, _add_rows(totals, expenses))
+        return totals["converted"]
+    totals = expenses.totals
+    if (totals is None or totals["rates"].serial != rates.serial
+            or totals["version"] != version or totals["length"] != len(expenses)):
+        totals = _new_totals(rates)
+        _convert_periods(totals, _add_rows(totals, expenses))
+        totals.update(version=version, length=len(expenses))
+        expenses.totals = totals
+    return totals["converted"]
+
+def _save(expenses, added=(), removed=()):
+    """Save ``expenses`` and apply the change to its cached buckets, if any."""
+    old_version = getattr(expenses, 'version', None)
+    save_expenses(expenses)
+    totals = getattr(expenses, 'totals', None)
+    if totals is None:
+        return
+    # Any other jump means another writer's rows were merged in.
+    if old_version is None or totals["version"] != old_version or expenses.version != old_version + 1:
+        expenses.totals = None
+        return
+    try:
+        touched = _add_rows(totals, added) | _add_rows(totals, removed, -1)
+        _convert_periods(totals, touched)
+    except (LookupError, ValueError):
+        expenses.totals = None
+        return
+    totals.update(version=expenses.version, length=len(expenses))
+
+def _category_minor_totals(expenses, rates):
+    totals = defaultdict(int)
+    for by_category in monthly_buckets(expenses, rates).values():
+        for category, minor in by_category.items():
+            totals[category] += minor
+    return totals
+
+def get_category_totals(expenses, rates=None):
+    totals = _category_minor_totals(expenses, rates)
+    return {category: to_major(minor) for category, minor in totals.items()}
+
+def get_summary(expenses, monthly_budget=15000.0, rates=None):
+    """Totals in the reporting currency of ``rates`` (amounts without a rate raise LookupError)."""
+    totals = _category_minor_totals(expenses, rates)
+    total_spent = to_major(sum(totals.values()))
     remaining = monthly_budget - total_spent
     per_day = remaining / 30
     return {
-        "category_totals": dict(category_totals),
+        "category_totals": {category: to_major(minor) for category, minor in totals.items()},
         "total_spent": total_spent,
         "budget_left": remaining,
-        "per_day": per_day
+        "per_day": per_day,
+        "currency": (rates or RateTable()).base
     }
 
 def format_summary(summary, currency="₹"):
+    """Render a summary; ``currency`` is the display symbol, checked against the summary's currency."""
+    if "currency" in summary:
+        currency = amount_prefix(summary["currency"], currency)
     lines = [
         f"Total Spent: {currency}{summary['total_spent']:.2f}",
         f"Budget Left: {currency}{summary['budget_left']:.2f}",
@@ -118,35 +315,42 @@ def get_display_category(category):
 def get_category_icon_path(category):
     return CATEGORY_ICONS.get(category, None)
 
-def get_bar_data_by_day(expenses):
-    data = defaultdict(float)
-    for e in expenses:
-        try:
-            d = datetime.datetime.strptime(e['date'], "%d-%m-%Y").date()
-            data[d] += e['amount']
-        except Exception:
-            continue
-    return dict(sorted(data.items()))
+def get_bar_data_by_day(expenses, rates=None):
+    data = grouped_totals(expenses, lambda e: parse_date(e['date']), rates)
+    return {d: to_major(minor) for d, minor in sorted(data.items())}
+
+def get_bar_data_by_month(expenses, rates=None):
+    data = defaultdict(int)
+    for (_, month), by_category in monthly_buckets(expenses, rates).items():
+        if month is not None:
+            data[month] += sum(by_category.values())
+    return {key: to_major(minor) for key, minor in sorted(data.items())}
+
+CSV_FIELDS = ['date', 'category', 'amount', 'currency', 'name']
 
-def get_bar_data_by_month(expenses):
-    data = defaultdict(float)
+def export_row(expense):
+    """Exported form of an expense, with ``amount`` as an exact decimal string.
+
+    This is the form import_expenses reads back, for CSV and JSON-lines alike.
+    """
+    row = {field: expense.get(field) for field in CSV_FIELDS}
+    row['amount'] = format_minor(expense['amount_minor'])
+    return row
+
+def write_csv(expenses, csvfile, delimiter=","):
+    """Stream expenses to an open text file as CSV."""
+    writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS, delimiter=delimiter)
+    writer.writeheader()
     for e in expenses:
-        try:
-            d = datetime.datetime.strptime(e['date'], "%d-%m-%Y").date()
-            key = f"{d.year}-{d.month:02d}"
-            data[key] += e['amount']
-        except Exception:
-            continue
-    return dict(sorted(data.items()))
+        writer.writerow(export_row(e))
 
 def export_to_csv(expenses, filepath):
     with open(filepath, 'w', newline='') as csvfile:
-        fieldnames = ['date', 'category', 'amount', 'name']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for e in expenses:
-            writer.writerow(e)
+        write_csv(expenses, csvfile)
 
 def search_and_filter(expenses, keyword="", category=None, start_date=None, end_date=None):
     results = search_expenses(expenses, keyword)
     return filter_expenses(results, category, start_date, end_date)
+
+def iter_search_and_filter(expenses, keyword="", category=None, start_date=None, end_date=None):
+    return iter_filter(iter_search(expenses, keyword), category, start_date, end_date)
@@ -24,6 +24,7 @@ class SettingsManager:
         self.settings = {
             "monthly_budget": 25000,
             "currency_symbol": "₹",
+            "currency_code": "INR",
             "theme": "litera",
             "csv_delimiter": ","
         }
@@ -59,6 +60,7 @@ class SettingsManager:
         self.settings = {
             "monthly_budget": 25000,
             "currency_symbol": "₹",
+            "currency_code": "INR",
             "theme": "litera",
             "csv_delimiter": ","
         }
@@ -73,3 +75,6 @@ class SettingsManager:
 
     def get_currency(self):
         return self.get("currency_symbol", "₹")
+
+    def get_currency_code(self):
+        return self.get("currency_code", "INR")
@@ -1,19 +1,341 @@
 #core/storage.py
 import json
+import logging
 import os
+import re
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from core.currency import DEFAULT_CURRENCY, to_minor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
 
 EXPENSES_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'expenses.json')
 
-def load_expenses():
-    if not os.path.exists(EXPENSES_FILE):
-        return []
+
+class Ledger(list):
+    """Expense rows loaded from ``path``, tagged with the file ``version`` they match.
+
+    ``base`` counts the rows as they were at that version; save_expenses diffs
+    against it to find this ledger's own changes, and keeps both current.
+    ``totals`` holds aggregates expense_manager derives from the rows, checked
+    against the version. Copies are plain lists, carry no version, and save as
+    all-new rows.
+    """
+
+    def __init__(self, rows=(), path=None, version=None):
+        super().__init__(rows)
+        self.path = path
+        self.version = version
+        self.base = Counter(_row_key(e) for e in self)
+        self.totals = None
+
+
+def _row_key(expense):
+    return json.dumps(expense, sort_keys=True)
+
+
+def _upgrade(expense):
+    """Upgrade a row saved before multi-currency support (float ``amount``, no currency).
+
+    Old rows were always entered in the default currency, so they are labelled
+    with DEFAULT_CURRENCY rather than whatever reporting currency is set now.
+    An amount that isn't a number is kept under ``legacy_amount`` and counted
+    as zero, so one bad row can't stop the ledger from loading.
+    """
+    if isinstance(expense, dict) and "amount_minor" not in expense:
+        amount = expense.pop("amount", 0)
+        try:
+            expense["amount_minor"] = to_minor(amount)
+        except ValueError:
+            logger.warning("Expense %r has invalid amount %r; counting it as 0", expense.get("name"), amount)
+            expense["amount_minor"] = 0
+            expense["legacy_amount"] = amount
+        expense.setdefault("currency", DEFAULT_CURRENCY)
+    return expense
+
+
+@contextmanager
+def _locked(path):
+    """Hold an exclusive advisory lock on ``<path>.lock`` for the duration of the block.
+
+    The lock only covers a single read-merge-write cycle, never a UI session.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.lock', 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read(path):
+    """Return ``(version, expenses)`` from disk, with legacy rows upgraded.
+
+    Rows are upgraded here so the merge snapshot has the same form callers save.
+    Accepts both the versioned ``{"version": n, "expenses": [...]}`` layout and
+    the original bare list (treated as version 0). A missing file is an empty
+    ledger at version 0; returns ``None`` if the file is unreadable, not in
+    either layout, or has a version that isn't a non-negative integer.
+    """
+    if not os.path.exists(path):
+        return 0, []
     try:
-        with open(EXPENSES_FILE, 'r') as file:
-            return json.load(file)
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
     except (json.JSONDecodeError, IOError):
-        return []
+        logger.exception("Error reading %s", path)
+        return None
+    if isinstance(data, list):
+        return 0, [_upgrade(e) for e in data]
+    if not isinstance(data, dict) or not isinstance(data.get("expenses", []), list):
+        logger.error("Unexpected layout in %s", path)
+        return None
+    version = data.get("version", 0)
+    if not isinstance(version, int) or isinstance(version, bool) or version < 0:
+        logger.error("Invalid version %r in %s", version, path)
+        return None
+    return version, [_upgrade(e) for e in data.get("expenses", [])]
+
+
+def _set_aside(path):
+    """Move an unreadable ledger out of the way and return the version it claimed.
+
+    The file is renamed to ``<path>.corrupt-<timestamp>`` so nothing is lost. The
+    version is recovered from the start of the file when possible, so the next
+    write never goes backwards.
+    """
+    with open(path, 'rb') as file:
+        head = file.read(4096).decode('utf-8', errors='replace')
+    match = re.match(r'\s*\{\s*"version"\s*:\s*(\d+)', head)
+
+    backup = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+    candidate, n = backup, 1
+    while os.path.exists(candidate):
+        candidate, n = f"{backup}-{n}", n + 1
+    os.replace(path, candidate)
+    logger.warning("Moved unreadable ledger %s to %s", path, candidate)
+    return int(match.group(1)) if match else 0
+
+
+def _write(path, version, expenses):
+    """Atomically replace ``path`` so readers never see a half-written file."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.expenses-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump({"version": version, "expenses": expenses}, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _peek_version(path):
+    """Version from the head of a file this module wrote, without parsing the rows.
+
+    Returns None when the head doesn't look like ``{"version": n, ...``.
+    """
+    try:
+        with open(path, 'rb') as file:
+            head = file.read(256).decode('utf-8', errors='replace')
+    except FileNotFoundError:
+        return 0
+    match = re.match(r'\s*\{\s*"version"\s*:\s*(\d+)\s*,', head)
+    return int(match.group(1)) if match else None
+
+
+def _merge(base, ours, ours_keys, theirs):
+    """Apply our changes since ``base`` on top of ``theirs``.
+
+    Rows have no ids, so they are compared by value: rows we dropped are removed
+    from ``theirs`` and rows we added are appended. An edit counts as a removal
+    plus an addition. Returns the merged rows and their keys.
+    """
+    removed = base - Counter(ours_keys)
+    added = Counter(ours_keys) - base
+
+    merged, merged_keys = [], []
+    for e in theirs:
+        key = _row_key(e)
+        if removed[key] > 0:
+            removed[key] -= 1
+        else:
+            merged.append(e)
+            merged_keys.append(key)
+    for key, e in zip(ours_keys, ours):
+        if added[key] > 0:
+            added[key] -= 1
+            merged.append(e)
+            merged_keys.append(key)
+    return merged, merged_keys
+
+
+def load_expenses():
+    path = os.path.normpath(EXPENSES_FILE)
+    with _locked(path):
+        result = _read(path)
+    if result is None:
+        return Ledger(path=path)
+    version, expenses = result
+    return Ledger(expenses, path, version)
+
 
 def save_expenses(expenses):
-    os.makedirs(os.path.dirname(EXPENSES_FILE), exist_ok=True)
-    with open(EXPENSES_FILE, 'w') as file:
-        json.dump(expenses, file, indent=4)
+    """Write ``expenses``, merging in anything other writers saved meanwhile.
+
+    If the file's version moved on since ``expenses`` was loaded, its changes
+    are replayed on top of the current contents. ``expenses`` is updated in
+    place to the merged ledger so callers keep working with what is on disk.
+
+    When nobody else wrote in between, only the file's first bytes are read.
+    Each save still hashes and rewrites the whole ledger, so its cost grows
+    with the ledger's size.
+    """
+    path = os.path.normpath(EXPENSES_FILE)
+    if isinstance(expenses, Ledger) and expenses.path == path and expenses.version is not None:
+        base_version, base = expenses.version, expenses.base
+    else:
+        base_version, base = 0, Counter()
+    keys = [_row_key(e) for e in expenses]
+    with _locked(path):
+        current_version = _peek_version(path)
+        if current_version != base_version:
+            current = _read(path)
+            if current is None:
+                # Unreadable file: keep a copy, and don't merge against "empty".
+                current_version = max(base_version, _set_aside(path))
+            else:
+                current_version, theirs = current
+                if current_version != base_version:
+                    expenses[:], keys = _merge(base, expenses, keys, theirs)
+
+        version = current_version + 1
+        _write(path, version, expenses)
+    if isinstance(expenses, Ledger):
+        expenses.path, expenses.version = path, version
+        expenses.base = Counter(keys)
+
+
+class _StreamReader:
+    """Incrementally decode JSON values from a text file, one chunk at a time."""
+
+    CHUNK = 1 << 16
+
+    def __init__(self, file):
+        self.file = file
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.pos > self.CHUNK:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.file.read(self.CHUNK)
+        if chunk:
+            self.buf += chunk
+        else:
+            self.eof = True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self._fill()
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # A number cut off at the buffer's edge decodes "successfully"; read on.
+            if end == len(self.buf) and not self.eof:
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def array(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def iter_expenses():
+    """Yield ledger rows one at a time without loading the whole file.
+
+    No lock is needed: saves replace the file atomically, so an open handle
+    keeps reading one complete version. Raises ``ValueError`` on a corrupt file.
+    """
+    path = os.path.normpath(EXPENSES_FILE)
+    try:
+        file = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with file:
+        reader = _StreamReader(file)
+        try:
+            if reader.peek() == '[':
+                yield from map(_upgrade, reader.array())
+                return
+            reader.expect('{')
+            if reader.peek() == '}':
+                return
+            while True:
+                key = reader.value()
+                reader.expect(':')
+                if key == "expenses":
+                    yield from map(_upgrade, reader.array())
+                    return
+                reader.value()
+                if reader.expect(',}') == '}':
+                    return
+        except ValueError as e:
+            raise ValueError(f"{path} is not a valid expense ledger: {e}")
@@ -10,6 +10,7 @@ from ttkbootstrap import Style, Window
 from ttkbootstrap.widgets import DateEntry
 
 from core import expense_manager
+from core.currency import RateTable, load_rate_table, to_minor
 from core.settings_manager import SettingsManager
 from gui.ui_helpers import create_main_ui, populate_table, refresh_summary
 from gui.settings_panel import open_settings_panel
@@ -27,6 +28,7 @@ class ExpenseTrackerApp(Window):
         self.expenses = expense_manager.load_expenses()
         self.filtered_expenses = self.expenses.copy()
         self.settings = self.settings_manager.settings
+        self.rates = self.load_rates()
 
         self.ui = create_main_ui(self)
         self.bind_events()
@@ -40,40 +42,60 @@ class ExpenseTrackerApp(Window):
         self.ui['search_btn'].configure(command=self.apply_filters)
         self.ui['clear_filters_btn'].configure(command=self.clear_filters)
         self.ui['settings_btn'].configure(command=self.open_settings)
-        self.ui['chart_pie_btn'].configure(command=lambda: show_pie_chart(self.filtered_expenses))
-        self.ui['chart_bar_btn'].configure(command=lambda: show_bar_chart(self.filtered_expenses))
+        self.ui['chart_pie_btn'].configure(command=lambda: self.show_chart(show_pie_chart))
+        self.ui['chart_bar_btn'].configure(command=lambda: self.show_chart(show_bar_chart))
         self.ui['toggle_theme_btn'].configure(command=self.toggle_theme)
         self.ui['today_btn'].configure(command=self.filter_today)
         self.ui['last7_btn'].configure(command=self.filter_last_7_days)
         self.ui['this_month_btn'].configure(command=self.filter_this_month)
 
+    def load_rates(self):
+        currency_code = self.settings_manager.get_currency_code()
+        try:
+            return load_rate_table(currency_code)
+        except (ValueError, OSError) as e:
+            messagebox.showerror(
+                "Exchange Rates",
+                f"Could not read exchange rates:\n{e}\n\nOnly {currency_code} amounts can be summarised until it is fixed."
+            )
+            return RateTable(currency_code)
+
     def add_expense(self):
         date = self.ui['date_entry'].entry.get()
         name = self.ui['name_entry'].get().strip()
         category = self.ui['category_entry'].get()
         amount = self.ui['amount_entry'].get().strip()
+        currency = self.ui['currency_entry'].get().strip() or self.rates.base
 
         if not (name and category and amount):
             messagebox.showwarning("Missing Fields", "Please fill in all the fields.")
             return
 
         try:
-            amount_val = float(amount)
+            to_minor(amount)
         except ValueError:
             messagebox.showerror("Invalid Amount", "Please enter a valid number for the amount.")
             return
 
         internal_category = expense_manager.get_internal_category_from_display(category)
-        expense_manager.add_expense(self.expenses, name, amount_val, internal_category, date)
+        try:
+            expense_manager.add_expense(self.expenses, name, amount, internal_category, date, currency, self.rates)
+        except ValueError as e:
+            messagebox.showerror("Invalid Expense", str(e))
+            return
 
         budget = self.settings.get('monthly_budget', 0)
         if budget > 0:
-            summary = expense_manager.get_summary(self.expenses, budget)
-            budget_percent = (summary['total_spent'] / budget) * 100
-            if 80 <= budget_percent < 100:
-                messagebox.showwarning("Budget Alert", "You've reached 80% of your monthly budget!")
-            elif budget_percent >= 100:
-                messagebox.showerror("Budget Exceeded", "You've exceeded your monthly budget!")
+            try:
+                summary = expense_manager.get_summary(self.expenses, budget, self.rates)
+            except (LookupError, ValueError) as e:
+                messagebox.showwarning("Missing Exchange Rate", str(e))
+            else:
+                budget_percent = (summary['total_spent'] / budget) * 100
+                if 80 <= budget_percent < 100:
+                    messagebox.showwarning("Budget Alert", "You've reached 80% of your monthly budget!")
+                elif budget_percent >= 100:
+                    messagebox.showerror("Budget Exceeded", "You've exceeded your monthly budget!")
 
         self.clear_filters()
         self.ui['name_entry'].delete(0, tk.END)
@@ -139,12 +161,20 @@ class ExpenseTrackerApp(Window):
 
     def open_settings(self):
         def on_close():
-            self.settings = SettingsManager().settings
+            self.settings_manager = SettingsManager()
+            self.settings = self.settings_manager.settings
+            self.rates = self.load_rates()
             populate_table(self)
             refresh_summary(self)
 
         open_settings_panel(self, on_close)
 
+    def show_chart(self, chart):
+        try:
+            chart(self.filtered_expenses, self.rates)
+        except (LookupError, ValueError) as e:
+            messagebox.showerror("Missing Exchange Rate", str(e))
+
     def toggle_theme(self):
         new_theme = "darkly" if self.theme == "litera" else "litera"
         self.theme = new_theme
@@ -3,12 +3,10 @@ import matplotlib.pyplot as plt
 from tkinter import Toplevel
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-def show_pie_chart(expenses):
-    category_totals = {}
-    for item in expenses:
-        category = item['category']
-        amount = item['amount']
-        category_totals[category] = category_totals.get(category, 0) + amount
+from core.expense_manager import get_category_totals
+
+def show_pie_chart(expenses, rates=None):
+    category_totals = get_category_totals(expenses, rates)
 
     fig, ax = plt.subplots()
     ax.pie(category_totals.values(), labels=category_totals.keys(), autopct='%1.1f%%')
@@ -16,16 +14,12 @@ def show_pie_chart(expenses):
 
     show_chart_window(fig)
 
-def show_bar_chart(expenses):
-    category_totals = {}
-    for item in expenses:
-        category = item['category']
-        amount = item['amount']
-        category_totals[category] = category_totals.get(category, 0) + amount
+def show_bar_chart(expenses, rates=None):
+    category_totals = get_category_totals(expenses, rates)
 
     fig, ax = plt.subplots()
     ax.bar(category_totals.keys(), category_totals.values())
-    ax.set_ylabel("Amount")
+    ax.set_ylabel(f"Amount ({rates.base})" if rates else "Amount")
     ax.set_title("Expenses by Category")
     ax.tick_params(axis='x', rotation=45)
 
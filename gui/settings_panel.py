@@ -7,7 +7,7 @@ def open_settings_panel(root, on_close_callback):
     settings = SettingsManager()
     settings_window = tk.Toplevel(root)
     settings_window.title("Settings")
-    settings_window.geometry("400x300")
+    settings_window.geometry("400x370")
     settings_window.resizable(False, False)
 
     # Monthly Budget
@@ -22,6 +22,12 @@ def open_settings_panel(root, on_close_callback):
     currency_entry = ttk.Entry(settings_window, textvariable=currency_var)
     currency_entry.pack(fill='x', padx=20)
 
+    # Reporting Currency
+    tk.Label(settings_window, text="Reporting Currency Code:").pack(pady=(15, 5))
+    currency_code_var = tk.StringVar(value=settings.get_currency_code())
+    currency_code_entry = ttk.Entry(settings_window, textvariable=currency_code_var)
+    currency_code_entry.pack(fill='x', padx=20)
+
     # CSV Delimiter
     tk.Label(settings_window, text="CSV Delimiter:").pack(pady=(15, 5))
     delimiter_var = tk.StringVar(value=settings.get("csv_delimiter"))
@@ -33,13 +39,15 @@ def open_settings_panel(root, on_close_callback):
         try:
             budget = float(budget_var.get())
             currency = currency_var.get().strip()
+            currency_code = currency_code_var.get().strip().upper()
             delimiter = delimiter_var.get().strip()
 
-            if not currency or not delimiter:
+            if not currency or not currency_code or not delimiter:
                 raise ValueError("Currency and delimiter cannot be empty.")
 
             settings.set("monthly_budget", budget)
             settings.set("currency_symbol", currency)
+            settings.set("currency_code", currency_code)
             settings.set("csv_delimiter", delimiter)
             settings.save_settings()
 
@@ -6,7 +6,9 @@ from PIL import Image, ImageTk
 import os
 import datetime
 
+from core.currency import amount_prefix
 from core.expense_manager import (
+    get_amount,
     get_display_category,
     get_summary,
     format_summary
@@ -39,27 +41,35 @@ def populate_table(app):
     if not app.filtered_expenses:
         tree.insert('', 'end', values=("No results found", "", "", ""))
     else:
+        currency = amount_prefix(app.rates.base, app.settings.get('currency_symbol', '₹'))
         for expense in app.filtered_expenses:
-            tag = color_code_row(expense['amount'])
+            amount = get_amount(expense)
+            tag = color_code_row(amount)
             display_category = get_display_category(expense['category'])
-            currency = app.settings.get('currency_symbol', '₹')
+            if expense['currency'] == app.rates.base:
+                display_amount = f"{currency}{amount:.2f}"
+            else:
+                display_amount = f"{amount:.2f} {expense['currency']}"
             tree.insert('', 'end', values=(
                 expense['date'],
                 expense['name'],
                 display_category,
-                f"{currency}{expense['amount']:.2f}"
+                display_amount
             ), tags=(tag,))
     style_table(tree)
 
 def refresh_summary(app):
     """Always display summary metrics for all expenses, regardless of filtering."""
     budget = app.settings.get("monthly_budget", 25000)
-    summary = get_summary(app.expenses, monthly_budget=budget)  # ✅ Always use app.expenses
     summary_text = app.ui['summary_text']
     summary_text.config(state='normal')
     summary_text.delete(1.0, tk.END)
     currency = app.settings.get("currency_symbol", "₹")
-    summary_text.insert(tk.END, format_summary(summary, currency))
+    try:
+        summary = get_summary(app.expenses, monthly_budget=budget, rates=app.rates)  # ✅ Always use app.expenses
+        summary_text.insert(tk.END, format_summary(summary, currency))
+    except (LookupError, ValueError) as e:
+        summary_text.insert(tk.END, f"Summary unavailable: {e}")
     summary_text.config(state='disabled')
 
 def create_main_ui(app):
@@ -88,8 +98,13 @@ def create_main_ui(app):
     amount_entry = ttk.Entry(top_frame)
     amount_entry.grid(row=0, column=7, padx=5)
 
+    ttk.Label(top_frame, text="Currency:").grid(row=0, column=8)
+    currency_entry = ttk.Entry(top_frame, width=6)
+    currency_entry.grid(row=0, column=9, padx=5)
+    currency_entry.insert(0, app.rates.base)
+
     add_btn = ttk.Button(top_frame, text="➕ Add")
-    add_btn.grid(row=0, column=8, padx=5)
+    add_btn.grid(row=0, column=10, padx=5)
 
     # --- Table Section ---
     tree = ttk.Treeview(frame, columns=("Date", "Name", "Category", "Amount"), show="headings")
@@ -172,6 +187,7 @@ def create_main_ui(app):
         "name_entry": name_entry,
         "category_entry": category_entry,
         "amount_entry": amount_entry,
+        "currency_entry": currency_entry,
         "search_entry": search_entry,
         "search_btn": search_btn,
         "clear_filters_btn": reset_btn,
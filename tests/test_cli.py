@@ -0,0 +1,96 @@
+import json
+import sys
+
+import pytest
+
+from core import cli, currency, settings_manager, storage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "EXPENSES_FILE", str(tmp_path / "expenses.json"))
+    monkeypatch.setattr(settings_manager, "DEFAULT_SETTINGS_PATH", str(tmp_path / "settings.json"))
+    monkeypatch.setattr(currency, "DEFAULT_RATES_PATH", str(tmp_path / "rates.csv"))
+    (tmp_path / "rates.csv").write_text("date,currency,rate\n2025-01-01,USD,80\n")
+    return tmp_path
+
+
+@pytest.fixture
+def imported(data_dir):
+    source = data_dir / "in.csv"
+    source.write_text(
+        "date,category,amount,currency,description\n"
+        "2025-08-01,food,150.00,,Cafe\n"
+        "05-09-2025,Home,10,USD,Hosting\n"
+    )
+    assert cli.main(["import", str(source)]) == 0
+    return data_dir
+
+
+def run(capsys, *argv):
+    code = cli.main(list(argv))
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def test_list_jsonl_and_csv(imported, capsys):
+    code, out, _ = run(capsys, "list")
+    assert code == 0
+    assert [json.loads(line) for line in out.splitlines()] == [
+        {"date": "2025-08-01", "category": "Food", "amount": "150.00", "currency": "INR", "name": "Cafe"},
+        {"date": "05-09-2025", "category": "Home", "amount": "10.00", "currency": "USD", "name": "Hosting"},
+    ]
+
+    code, out, _ = run(capsys, "list", "-f", "csv", "--from", "2025-09-01")
+    assert out.splitlines() == ["date,category,amount,currency,name", "05-09-2025,Home,10.00,USD,Hosting"]
+
+
+def test_jsonl_round_trip(imported, capsys):
+    exported = imported / "out.jsonl"
+    assert cli.main(["export", str(exported), "-f", "jsonl"]) == 0
+    assert cli.main(["import", "-f", "jsonl", str(exported)]) == 0
+    code, out, _ = run(capsys, "summary", "-f", "json")
+    assert json.loads(out)["category_totals"] == {"Food": 300.0, "Home": 1600.0}
+
+
+def test_summary_and_monthly(imported, capsys):
+    code, out, _ = run(capsys, "summary", "-b", "2000")
+    assert code == 0
+    assert "Total Spent: ₹950.00" in out
+
+    code, out, _ = run(capsys, "monthly", "-f", "csv")
+    assert out.splitlines() == ["month,amount", "2025-08,150.0", "2025-09,800.0"]
+
+
+def test_import_is_all_or_nothing(imported, capsys):
+    bad = imported / "bad.csv"
+    bad.write_text("date,category,amount\n2025-08-02,Fun,5\n2025/13/45,Fun,5\n")
+    code, _, err = run(capsys, "import", str(bad))
+    assert code == 2
+    assert "line 3" in err and "nothing was imported" in err
+    assert len(storage.load_expenses()) == 2
+
+
+@pytest.mark.parametrize("argv", [
+    ["import", "/nonexistent/in.csv"],
+    ["list", "-o", "/nonexistent/dir/out.csv"],
+])
+def test_os_errors_exit_2(data_dir, capsys, argv):
+    code, _, err = run(capsys, *argv)
+    assert code == 2
+    assert err.startswith("error: ")
+
+
+def test_broken_pipe_exits_quietly(imported, tmp_path, monkeypatch):
+    sink = open(tmp_path / "sink", "w")
+
+    class ClosedPipe:
+        def write(self, _):
+            raise BrokenPipeError
+
+        def fileno(self):
+            return sink.fileno()
+
+    monkeypatch.setattr(sys, "stdout", ClosedPipe())
+    assert cli.main(["list"]) == 1
+    sink.close()
@@ -0,0 +1,115 @@
+import datetime
+
+import pytest
+
+from core import expense_manager, storage
+from core.currency import RateTable, amount_prefix, to_minor
+
+
+@pytest.fixture
+def rates():
+    return RateTable("INR", [
+        (datetime.date(2025, 1, 1), "USD", "83.10"),
+        (datetime.date(2025, 9, 1), "USD", "88.25"),
+    ])
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "EXPENSES_FILE", str(tmp_path / "expenses.json"))
+    return storage.load_expenses()
+
+
+def expense(amount, currency="INR", date="2025-08-15", category="Food"):
+    return expense_manager.make_expense("x", amount, category, date, currency)
+
+
+def test_to_minor_is_exact():
+    assert to_minor("0.1") + to_minor("0.2") == to_minor("0.3")
+    assert to_minor(10.005) == 1000
+    for bad in ("abc", "nan", "inf", None):
+        with pytest.raises(ValueError):
+            to_minor(bad)
+
+
+def test_rate_periods(rates):
+    assert rates.rate("USD", datetime.date(2025, 8, 31)) == rates.rate("USD", datetime.date(2025, 1, 1))
+    assert rates.period_start("USD", datetime.date(2025, 9, 1)) == datetime.date(2025, 9, 1)
+    assert rates.period_start("INR", datetime.date(2000, 1, 1)) is None
+    with pytest.raises(LookupError):
+        rates.rate("USD", datetime.date(2024, 12, 31))
+    with pytest.raises(LookupError):
+        rates.rate("UDS", datetime.date(2025, 8, 1))
+
+
+@pytest.mark.parametrize("line", ["2025-01-01,USD,abc", "2025/01/01,USD,1", "2025-01-01,USD,0", "2025-01-01,USD"])
+def test_bad_rate_file_names_line(tmp_path, line):
+    path = tmp_path / "rates.csv"
+    path.write_text(f"date,currency,rate\n2025-01-01,EUR,90\n{line}\n")
+    with pytest.raises(ValueError, match="line 3"):
+        RateTable.from_file(str(path))
+
+
+def test_summary_and_monthly_convert_per_rate_period(rates):
+    expenses = [
+        expense("150.00"),
+        expense("10", "USD", "05-09-2025", "Home"),
+        expense("4", "USD", "2025-08-15", "Fun"),
+        expense("6", "USD", "2025-08-20", "Fun"),
+    ]
+    summary = expense_manager.get_summary(expenses, 1000, rates)
+    assert summary["category_totals"] == {"Food": 150.0, "Home": 882.5, "Fun": 831.0}
+    assert summary["total_spent"] == 1863.5
+    assert expense_manager.get_bar_data_by_month(expenses, rates) == {"2025-08": 981.0, "2025-09": 882.5}
+
+
+def test_unconvertible_currency_is_rejected(rates):
+    with pytest.raises(ValueError, match="UDS"):
+        expense_manager.make_expense("x", "1", "Food", "2025-08-01", "UDS", rates)
+    with pytest.raises(ValueError, match="Invalid date"):
+        expense_manager.make_expense("x", "1", "food", "2025/13/45")
+
+
+def test_ledger_buckets_update_only_touched_periods(ledger, rates, monkeypatch):
+    expense_manager.add_expense(ledger, "a", "10", "Food", "2025-08-01", "USD", rates)
+    expense_manager.add_expense(ledger, "b", "5", "Fun", "2025-09-02")
+    assert expense_manager.get_summary(ledger, rates=rates)["total_spent"] == 836.0
+
+    calls = []
+    add_rows = expense_manager._add_rows
+    monkeypatch.setattr(expense_manager, "_add_rows", lambda t, rows, sign=1: calls.append(len(rows)) or add_rows(t, rows, sign))
+
+    expense_manager.add_expense(ledger, "c", "2", "Food", "2025-09-03", "USD", rates)
+    expense_manager.update_expense(ledger, 1, dict(ledger[1], amount_minor=700))
+    expense_manager.delete_expense(ledger, 0)
+    summary = expense_manager.get_summary(ledger, rates=rates)
+    monthly = expense_manager.get_bar_data_by_month(ledger, rates)
+    # One or two rows per save, and no rebuild of the whole ledger.
+    assert calls == [1, 0, 1, 1, 0, 1]
+
+    assert summary == expense_manager.get_summary(list(ledger), rates=rates)
+    assert monthly == expense_manager.get_bar_data_by_month(list(ledger), rates) == {"2025-09": 183.5}
+    assert summary["category_totals"] == {"Fun": 7.0, "Food": 176.5}
+
+
+def test_ledger_buckets_rebuilt_after_merge(ledger, rates):
+    expense_manager.add_expense(ledger, "a", "10", "Food", "2025-08-01")
+    assert expense_manager.get_summary(ledger, rates=rates)["total_spent"] == 10.0
+
+    other = storage.load_expenses()
+    expense_manager.add_expense(other, "theirs", "1", "Food", "2025-08-01", "USD", rates)
+    expense_manager.add_expense(ledger, "b", "5", "Food", "2025-08-02")
+    assert ledger.totals is None
+    assert expense_manager.get_summary(ledger, rates=rates)["total_spent"] == 98.1
+
+
+def test_amount_prefix_matches_currency():
+    assert amount_prefix("INR", "₹") == "₹"
+    assert amount_prefix("USD", "₹") == "$"
+    assert amount_prefix("CHF", "₹") == "CHF "
+    assert amount_prefix("INR", "Rs ") == "Rs "
+
+
+def test_format_summary_labels_reporting_currency():
+    summary = expense_manager.get_summary([], 100, RateTable("USD"))
+    assert expense_manager.format_summary(summary, "₹").startswith("Total Spent: $0.00")
@@ -0,0 +1,171 @@
+import json
+import multiprocessing
+
+import pytest
+
+from core import storage
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    path = tmp_path / "data" / "expenses.json"
+    monkeypatch.setattr(storage, "EXPENSES_FILE", str(path))
+    return path
+
+
+def row(name, amount_minor=100, currency="INR"):
+    return {"name": name, "amount_minor": amount_minor, "currency": currency,
+            "category": "Food", "date": "01-01-2025"}
+
+
+def legacy_row(name, amount=1.0):
+    return {"name": name, "amount": amount, "category": "Food", "date": "01-01-2025"}
+
+
+def other_process_saves(path, expenses):
+    """Write the file the way another process would, bumping its version."""
+    version, _ = storage._read(str(path))
+    storage._write(str(path), version + 1, expenses)
+
+
+def hammer(path, writer, count):
+    storage.EXPENSES_FILE = path
+    expenses = storage.load_expenses()
+    for i in range(count):
+        expenses.append(row(f"{writer}-{i}"))
+        storage.save_expenses(expenses)
+        if i % 5 == 0:
+            expenses.remove(row(f"{writer}-{i}"))
+            storage.save_expenses(expenses)
+
+
+def test_concurrent_writers_keep_every_change(ledger):
+    writers, count = 6, 30
+    procs = [
+        multiprocessing.Process(target=hammer, args=(str(ledger), w, count))
+        for w in range(writers)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    names = sorted(e["name"] for e in storage.load_expenses())
+    expected = sorted(f"{w}-{i}" for w in range(writers) for i in range(count) if i % 5)
+    assert names == expected
+
+
+def test_edit_merges_with_concurrent_add(ledger):
+    storage.save_expenses([row("a"), row("b")])
+    expenses = storage.load_expenses()
+
+    other_process_saves(ledger, [row("a"), row("b"), row("theirs")])
+    expenses[0] = row("a", 200)
+    storage.save_expenses(expenses)
+
+    assert storage.load_expenses() == [row("b"), row("theirs"), row("a", 200)]
+
+
+def test_each_ledger_merges_against_its_own_load(ledger):
+    storage.save_expenses([row("a")])
+    first = storage.load_expenses()
+    other_process_saves(ledger, [row("a"), row("X")])
+    second = storage.load_expenses()
+
+    first.append(row("Y"))
+    storage.save_expenses(first)
+    assert [e["name"] for e in storage.load_expenses()] == ["a", "X", "Y"]
+
+    second.append(row("Z"))
+    storage.save_expenses(second)
+    assert [e["name"] for e in storage.load_expenses()] == ["a", "X", "Y", "Z"]
+
+
+def test_duplicate_rows_are_counted(ledger):
+    storage.save_expenses([row("dup"), row("dup"), row("x")])
+    expenses = storage.load_expenses()
+
+    other_process_saves(ledger, [row("dup"), row("dup"), row("x"), row("dup")])
+    expenses.remove(row("dup"))
+    storage.save_expenses(expenses)
+
+    assert storage.load_expenses() == [row("dup"), row("x"), row("dup")]
+
+
+def test_bare_list_file_is_version_zero(ledger):
+    ledger.parent.mkdir(parents=True)
+    ledger.write_text(json.dumps([row("old")]))
+    assert storage._read(str(ledger)) == (0, [row("old")])
+
+
+def test_legacy_rows_upgrade_to_default_currency(ledger):
+    ledger.parent.mkdir(parents=True)
+    ledger.write_text(json.dumps([legacy_row("old", 10.5)]))
+    assert storage.load_expenses() == [row("old", 1050, "INR")]
+    assert list(storage.iter_expenses()) == [row("old", 1050, "INR")]
+
+
+def test_legacy_row_with_bad_amount_still_loads(ledger):
+    ledger.parent.mkdir(parents=True)
+    ledger.write_text(json.dumps([legacy_row("bad", None), legacy_row("ok", 2.5)]))
+    expenses = storage.load_expenses()
+    assert expenses[0] == dict(row("bad", 0), legacy_amount=None)
+    assert expenses[1] == row("ok", 250)
+
+
+def test_legacy_ledger_merge_does_not_duplicate(ledger):
+    ledger.parent.mkdir(parents=True)
+    ledger.write_text(json.dumps([legacy_row("a"), legacy_row("b")]))
+    expenses = storage.load_expenses()
+
+    # Another process loaded the same legacy file, added a row and saved.
+    other_process_saves(ledger, [row("a"), row("b"), row("fromB")])
+    expenses.append(row("fromA"))
+    storage.save_expenses(expenses)
+
+    assert [e["name"] for e in storage.load_expenses()] == ["a", "b", "fromB", "fromA"]
+
+
+@pytest.mark.parametrize("content, old_version", [
+    ("null", 0),
+    ("42", 0),
+    ("{\"expenses\": 3}", 0),
+    ("[{\"name\"", 0),
+    ("{\"version\": \"3\", \"expenses\": []}", 0),
+    ("{\n    \"version\": 9,\n    \"expenses\": [{\"name", 9),
+])
+def test_unreadable_file_is_kept_and_version_moves_forward(ledger, content, old_version):
+    ledger.parent.mkdir(parents=True)
+    ledger.write_text(content)
+    assert storage._read(str(ledger)) is None
+
+    expenses = storage.load_expenses()
+    expenses.append(row("new"))
+    storage.save_expenses(expenses)
+
+    backups = list(ledger.parent.glob("expenses.json.corrupt-*"))
+    assert [b.read_text() for b in backups] == [content]
+    version, rows = storage._read(str(ledger))
+    assert version == old_version + 1
+    assert rows == [row("new")]
+
+
+@pytest.mark.parametrize("layout", ["versioned", "bare"])
+def test_iter_expenses_streams_across_chunks(ledger, monkeypatch, layout):
+    monkeypatch.setattr(storage._StreamReader, "CHUNK", 7)
+    rows = [row(f"r{i}", i * 150) for i in range(50)]
+    ledger.parent.mkdir(parents=True)
+    if layout == "versioned":
+        ledger.write_text(json.dumps({"version": 123456789, "expenses": rows}, indent=4))
+    else:
+        ledger.write_text(json.dumps(rows))
+    assert list(storage.iter_expenses()) == rows
+
+
+def test_iter_expenses_missing_and_corrupt(ledger):
+    assert list(storage.iter_expenses()) == []
+    ledger.parent.mkdir(parents=True)
+    ledger.write_text('{"version": 1, "expenses": [{"name": "a"}, ')
+    with pytest.raises(ValueError):
+        list(storage.iter_expenses())